@@ -2,6 +2,9 @@ const express = require('express');
 const multer = require('multer');
 const path = require('path');
 const fs = require('fs');
+const crypto = require('crypto');
+const os = require('os');
+const { Readable } = require('stream');
 const { v4: uuidv4 } = require('uuid');
 const ffmpeg = require('fluent-ffmpeg');
 const cors = require('cors');
@@ -67,23 +70,236 @@ const io = socketIO(server, {
 
 const PORT = process.env.PORT || 3000;
 
+// Look up an executable on PATH (or the fluent-ffmpeg env override) once,
+// instead of spawning a process to check for it on every request
+function findExecutable(name, envOverride) {
+  if (process.env[envOverride]) {
+    return fs.existsSync(process.env[envOverride]);
+  }
+
+  const extensions = process.platform === 'win32'
+    ? (process.env.PATHEXT || '.EXE').split(';')
+    : [''];
+  const dirs = (process.env.PATH || '').split(path.delimiter).filter(Boolean);
+
+  return dirs.some(dir => extensions.some(ext => fs.existsSync(path.join(dir, name + ext))));
+}
+
+const HAS_FFMPEG = findExecutable('ffmpeg', 'FFMPEG_PATH');
+const HAS_FFPROBE = findExecutable('ffprobe', 'FFPROBE_PATH');
+
+// Paths resolved once at startup and shared by every route
+const rootDir = path.join(__dirname, '..');
+const frontendDir = path.join(rootDir, 'frontend');
+const publicDir = path.join(rootDir, 'public');
+const uploadsDir = path.join(publicDir, 'uploads');
+const tempDir = path.join(publicDir, 'temp');
+const assetsDir = path.join(publicDir, 'assets');
+const projectsDir = path.join(publicDir, 'projects');
+
+// Media paths from the client are URLs served from public/ (e.g.
+// "/uploads/<file>"), so resolve them against publicDir
+function resolveMediaPath(mediaPath) {
+  return path.join(publicDir, mediaPath);
+}
+
 // Middleware
 app.use(cors());
 app.use(express.json());
-app.use(express.static(path.join(__dirname, '../frontend')));
-app.use('/uploads', express.static(path.join(__dirname, '../public/uploads')));
-app.use('/temp', express.static(path.join(__dirname, '../public/temp')));
-app.use('/assets', express.static(path.join(__dirname, '../public/assets')));
+app.use(express.static(frontendDir));
+// Uploads, thumbnails and exports get unique file names, so browsers can keep
+// decoded copies instead of revalidating them on every project load
+const immutableStaticOptions = { maxAge: '7d', immutable: true };
+app.use('/uploads', express.static(uploadsDir, immutableStaticOptions));
+app.use('/temp', express.static(tempDir, immutableStaticOptions));
+app.use('/assets', express.static(assetsDir));
+
+// Directories already created or verified, so repeated requests skip the
+// stat/mkdir round trip
+const ensuredDirs = new Set();
+
+function ensureDir(dir) {
+  if (ensuredDirs.has(dir)) return;
+  fs.mkdirSync(dir, { recursive: true });
+  ensuredDirs.add(dir);
+}
 
 // Ensure directories exist
-const uploadsDir = path.join(__dirname, '../public/uploads');
-const tempDir = path.join(__dirname, '../public/temp');
-[uploadsDir, tempDir].forEach(dir => {
-  if (!fs.existsSync(dir)) {
-    fs.mkdirSync(dir, { recursive: true });
+[uploadsDir, tempDir].forEach(ensureDir);
+
+// Persistent ffprobe cache, keyed by absolute path, size and mtime so
+// results survive restarts and are invalidated when a file changes
+const probeCacheFile = path.join(publicDir, 'ffprobe-cache.json');
+const probeCache = {
+  entries: null,
+  flushTimer: null,
+  writing: false,
+
+  load() {
+    if (this.entries) return;
+    try {
+      const entries = JSON.parse(fs.readFileSync(probeCacheFile, 'utf8'));
+      // Drop entries not in the { size, mtimeMs, metadata } format
+      this.entries = {};
+      Object.keys(entries).forEach(filePath => {
+        if (entries[filePath] && entries[filePath].metadata) {
+          this.entries[filePath] = entries[filePath];
+        }
+      });
+      logger.debug(`Loaded ${Object.keys(this.entries).length} cached ffprobe results`);
+    } catch (e) {
+      this.entries = {};
+    }
+  },
+
+  // One entry per file, so a changed file replaces its old result instead
+  // of adding another one
+  get(filePath, stats) {
+    this.load();
+    const entry = this.entries[path.resolve(filePath)];
+    if (entry && entry.size === stats.size && entry.mtimeMs === stats.mtimeMs) {
+      return entry.metadata;
+    }
+    return null;
+  },
+
+  set(filePath, stats, metadata) {
+    this.load();
+    this.entries[path.resolve(filePath)] = { size: stats.size, mtimeMs: stats.mtimeMs, metadata };
+    this.scheduleFlush();
+  },
+
+  delete(filePath) {
+    this.load();
+    const key = path.resolve(filePath);
+    if (this.entries[key]) {
+      delete this.entries[key];
+      this.scheduleFlush();
+    }
+  },
+
+  scheduleFlush() {
+    if (this.flushTimer) return;
+    this.flushTimer = setTimeout(() => this.flush(), 1000);
+    this.flushTimer.unref();
+  },
+
+  flush() {
+    clearTimeout(this.flushTimer);
+    this.flushTimer = null;
+    if (!this.entries) return;
+    // Only one write at a time; changes made meanwhile go out in the next one
+    if (this.writing) {
+      return this.scheduleFlush();
+    }
+    this.writing = true;
+    fs.writeFile(probeCacheFile, JSON.stringify(this.entries), (err) => {
+      this.writing = false;
+      if (err) {
+        logger.warn(`Could not write ffprobe cache: ${err.message}`);
+      }
+    });
+  },
+
+  // Synchronous variant for process exit, when async I/O never completes
+  flushSync() {
+    // Nothing to do unless a write is pending or was cut off mid-flight
+    if (!this.entries || (!this.flushTimer && !this.writing)) return;
+    clearTimeout(this.flushTimer);
+    this.flushTimer = null;
+    try {
+      fs.writeFileSync(probeCacheFile, JSON.stringify(this.entries));
+    } catch (e) {
+      logger.warn(`Could not write ffprobe cache: ${e.message}`);
+    }
   }
+};
+
+process.on('exit', () => probeCache.flushSync());
+['SIGINT', 'SIGTERM'].forEach(signal => {
+  process.on(signal, () => process.exit(0));
 });
 
+// Probe a media file, reusing the cached result when the file is unchanged
+function probeMedia(filePath, callback) {
+  if (!HAS_FFPROBE) {
+    return callback(new Error('ffprobe is not installed'));
+  }
+
+  fs.stat(filePath, (statErr, stats) => {
+    if (statErr) {
+      if (statErr.code === 'ENOENT') {
+        probeCache.delete(filePath);
+      }
+      return callback(statErr);
+    }
+
+    const cached = probeCache.get(filePath, stats);
+    if (cached) {
+      return callback(null, cached);
+    }
+
+    runProbe(filePath, (err, metadata) => {
+      if (err) {
+        return callback(err);
+      }
+      probeCache.set(filePath, stats, metadata);
+      callback(null, metadata);
+    });
+  });
+}
+
+// Container headers carry duration and dimensions for the formats we accept,
+// so read as little of the file as possible and skip stream analysis
+const FAST_PROBE_OPTIONS = ['-hide_banner', '-v', 'error', '-probesize', '32k', '-analyzeduration', '0'];
+const FULL_PROBE_OPTIONS = ['-hide_banner', '-v', 'error'];
+
+// ffmpeg runs whose progress isn't tracked only need to report errors, so
+// they skip the banner and per-frame status output on stderr
+const QUIET_FFMPEG_OPTIONS = ['-hide_banner', '-loglevel error'];
+
+// Run a shallow ffprobe, falling back to a full probe when the container
+// does not report a duration (e.g. raw elementary streams)
+function runProbe(filePath, callback) {
+  ffmpeg.ffprobe(filePath, FAST_PROBE_OPTIONS, (err, metadata) => {
+    // Durations ffprobe can't determine come back as the string 'N/A'
+    if (!err && metadata.format && Number(metadata.format.duration) > 0) {
+      return callback(null, metadata);
+    }
+    logger.debug(`Shallow probe incomplete, running full probe: ${path.basename(filePath)}`);
+    ffmpeg.ffprobe(filePath, FULL_PROBE_OPTIONS, callback);
+  });
+}
+
+// Probe project media in the background so later requests hit the cache
+function warmProbeCache(mediaItems) {
+  const paths = (mediaItems || [])
+    .filter(item => item.path && item.type !== 'image')
+    .map(item => resolveMediaPath(item.path));
+  let index = 0;
+
+  const next = () => {
+    if (index >= paths.length) return;
+    probeMedia(paths[index++], () => next());
+  };
+
+  next();
+}
+
+// Accepted media extensions, grouped by the type they are imported as
+const VIDEO_EXTS = new Set(['.mp4', '.avi', '.mkv', '.mov', '.webm']);
+const AUDIO_EXTS = new Set(['.mp3', '.wav']);
+const IMAGE_EXTS = new Set(['.png', '.jpg', '.jpeg', '.gif']);
+
+// Classify a file by extension; returns null for unsupported files
+function getMediaType(filename) {
+  const ext = path.extname(filename).toLowerCase();
+  if (VIDEO_EXTS.has(ext)) return 'video';
+  if (AUDIO_EXTS.has(ext)) return 'audio';
+  if (IMAGE_EXTS.has(ext)) return 'image';
+  return null;
+}
+
 // Configure multer for file uploads
 const storage = multer.diskStorage({
   destination: (req, file, cb) => {
@@ -95,19 +311,20 @@ const storage = multer.diskStorage({
   }
 });
 
+// Most files accepted in one batch upload request
+const MAX_BATCH_FILES = 50;
+
 const upload = multer({
   storage: storage,
   limits: { fileSize: 500 * 1024 * 1024 }, // 500MB limit
   fileFilter: (req, file, cb) => {
-    const allowedTypes = /mp4|avi|mkv|mov|webm|mp3|wav|png|jpg|jpeg|gif/;
-    const extname = allowedTypes.test(path.extname(file.originalname).toLowerCase());
-    const mimetype = allowedTypes.test(file.mimetype);
-
-    if (mimetype && extname) {
+    if (getMediaType(file.originalname)) {
       return cb(null, true);
-    } else {
-      cb(new Error('Invalid file type'));
     }
+    // Skip unsupported files instead of failing the whole request, and
+    // report them back so the client can tell the user
+    req.rejectedFiles = (req.rejectedFiles || []).concat(file.originalname);
+    cb(null, false);
   }
 });
 
@@ -123,112 +340,230 @@ io.on('connection', (socket) => {
 // API Routes
 
 // Upload media file
-app.post('/api/upload', upload.single('file'), async (req, res) => {
+app.post('/api/upload', upload.single('file'), (req, res) => {
+  if (!req.file) {
+    const error = req.rejectedFiles ? 'Invalid file type' : 'No file uploaded';
+    return res.status(400).json({ error });
+  }
+
   try {
-    if (!req.file) {
-      return res.status(400).json({ error: 'No file uploaded' });
-    }
+    processUploadedFile(req.file, (fileInfo) => {
+      res.json(fileInfo);
+    });
+  } catch (error) {
+    logger.error('Upload error', error);
+    res.status(500).json({ error: error.message });
+  }
+});
+
+// Upload several media files in a single request
+app.post('/api/upload/batch', upload.array('files', MAX_BATCH_FILES), (req, res) => {
+  const rejected = req.rejectedFiles || [];
+
+  if (!req.files || req.files.length === 0) {
+    const error = rejected.length > 0 ? 'Invalid file type' : 'No files uploaded';
+    return res.status(400).json({ error, rejected });
+  }
+
+  if (rejected.length > 0) {
+    logger.warn(`Skipped ${rejected.length} unsupported file(s): ${rejected.join(', ')}`);
+  }
+
+  try {
+    logger.info(`Processing batch upload of ${req.files.length} file(s)`);
+    generateMediaInfo(req.files, (items) => {
+      logger.success(`Batch upload completed: ${items.length} file(s)`);
+      res.json({ items, rejected });
+    });
+  } catch (error) {
+    logger.error('Batch upload error', error);
+    res.status(500).json({ error: error.message });
+  }
+});
+
+// Number of ffprobe/ffmpeg jobs allowed to run at once
+const MAX_MEDIA_WORKERS = Math.max(1, os.cpus().length);
+
+// Process a list of uploaded files, preserving upload order in the result
+function generateMediaInfo(files, callback) {
+  runWithConcurrency(files, MAX_MEDIA_WORKERS, processUploadedFile, callback);
+}
+
+// Run an async worker over every item with at most `limit` in flight,
+// collecting results in input order
+function runWithConcurrency(items, limit, worker, callback) {
+  const results = new Array(items.length);
+  let nextIndex = 0;
+  let completed = 0;
+
+  if (items.length === 0) {
+    return callback(results);
+  }
+
+  const startNext = () => {
+    const index = nextIndex++;
+    worker(items[index], (result) => {
+      results[index] = result;
+      completed++;
+      if (completed === items.length) {
+        callback(results);
+      } else if (nextIndex < items.length) {
+        startNext();
+      }
+    });
+  };
+
+  for (let i = 0; i < Math.min(limit, items.length); i++) {
+    startNext();
+  }
+}
 
-    const filePath = req.file.path;
-    const fileInfo = {
-      id: uuidv4(),
-      filename: req.file.filename,
-      originalName: req.file.originalname,
-      path: `/uploads/${req.file.filename}`,
-      size: req.file.size,
-      type: req.file.mimetype.startsWith('video') ? 'video' :
-            req.file.mimetype.startsWith('audio') ? 'audio' : 'image'
+// Extract metadata and thumbnail for a single uploaded file
+function processUploadedFile(file, callback) {
+  const filePath = file.path;
+  const fileInfo = {
+    id: uuidv4(),
+    filename: file.filename,
+    originalName: file.originalname,
+    path: `/uploads/${file.filename}`,
+    size: file.size,
+    type: getMediaType(file.originalname)
+  };
+
+  // Get video metadata. The thumbnail doesn't depend on the probe result, so
+  // both ffprobe and the thumbnail ffmpeg run at once and the file is
+  // reported when the slower of the two finishes.
+  if (fileInfo.type === 'video') {
+    logger.info(`Processing video file: ${file.originalname}`);
+    let pending = 2;
+    const done = () => {
+      if (--pending === 0) {
+        logger.success(`File uploaded: ${file.originalname}`);
+        callback(fileInfo);
+      }
     };
 
-    // Get video metadata
-    if (fileInfo.type === 'video') {
-      logger.info(`Processing video file: ${req.file.originalname}`);
-      ffmpeg.ffprobe(filePath, (err, metadata) => {
-        if (err) {
-          logger.error('FFprobe error', err);
-          fileInfo.duration = 0;
-          fileInfo.width = 0;
-          fileInfo.height = 0;
-        } else {
-          const videoStream = metadata.streams.find(s => s.codec_type === 'video');
-          fileInfo.duration = metadata.format.duration || 0;
-          fileInfo.width = videoStream ? videoStream.width : 0;
-          fileInfo.height = videoStream ? videoStream.height : 0;
-          // Parse frame rate safely (e.g., "30/1" or "29.97")
-          if (videoStream && videoStream.r_frame_rate) {
-            const fpsStr = videoStream.r_frame_rate;
-            if (fpsStr.includes('/')) {
-              const [num, den] = fpsStr.split('/').map(Number);
-              fileInfo.fps = den > 0 ? num / den : 30;
-            } else {
-              fileInfo.fps = parseFloat(fpsStr) || 30;
-            }
+    probeMedia(filePath, (err, metadata) => {
+      if (err) {
+        logger.error('FFprobe error', err);
+        fileInfo.duration = 0;
+        fileInfo.width = 0;
+        fileInfo.height = 0;
+      } else {
+        const videoStream = metadata.streams.find(s => s.codec_type === 'video');
+        fileInfo.duration = Number(metadata.format.duration) || 0;
+        fileInfo.width = videoStream ? videoStream.width : 0;
+        fileInfo.height = videoStream ? videoStream.height : 0;
+        // Parse frame rate safely (e.g., "30/1" or "29.97")
+        if (videoStream && videoStream.r_frame_rate) {
+          const fpsStr = videoStream.r_frame_rate;
+          if (fpsStr.includes('/')) {
+            const [num, den] = fpsStr.split('/').map(Number);
+            fileInfo.fps = den > 0 ? num / den : 30;
           } else {
-            fileInfo.fps = 30;
+            fileInfo.fps = parseFloat(fpsStr) || 30;
           }
-          logger.success(`Video metadata extracted: ${fileInfo.width}x${fileInfo.height}, ${fileInfo.duration.toFixed(2)}s, ${fileInfo.fps.toFixed(2)}fps`);
+        } else {
+          fileInfo.fps = 30;
         }
+        logger.success(`Video metadata extracted: ${fileInfo.width}x${fileInfo.height}, ${fileInfo.duration.toFixed(2)}s, ${fileInfo.fps.toFixed(2)}fps`);
+      }
+      done();
+    });
 
-        // Generate thumbnail
-        generateThumbnail(filePath, req.file.filename, (thumbnailPath) => {
-          fileInfo.thumbnail = thumbnailPath;
-          logger.success(`File uploaded: ${req.file.originalname}`);
-          res.json(fileInfo);
-        });
-      });
-    } else if (fileInfo.type === 'audio') {
-      logger.info(`Processing audio file: ${req.file.originalname}`);
-      ffmpeg.ffprobe(filePath, (err, metadata) => {
-        if (!err) {
-          fileInfo.duration = metadata.format.duration || 0;
-          logger.success(`Audio metadata extracted: ${fileInfo.duration.toFixed(2)}s`);
-        }
-        logger.success(`File uploaded: ${req.file.originalname}`);
-        res.json(fileInfo);
-      });
-    } else {
-      // Image
-      logger.info(`Processing image file: ${req.file.originalname}`);
-      fileInfo.thumbnail = fileInfo.path;
-      fileInfo.duration = 5; // Default 5 seconds for images
-      logger.success(`File uploaded: ${req.file.originalname}`);
-      res.json(fileInfo);
-    }
-  } catch (error) {
-    logger.error('Upload error', error);
-    res.status(500).json({ error: error.message });
+    // Generate thumbnail
+    generateThumbnail(filePath, file.filename, VIDEO_THUMBNAIL_OPTIONS, (thumbnailPath, thumbnailData) => {
+      fileInfo.thumbnail = thumbnailPath;
+      if (thumbnailData) {
+        fileInfo.thumbnailData = thumbnailData;
+      }
+      done();
+    });
+  } else if (fileInfo.type === 'audio') {
+    logger.info(`Processing audio file: ${file.originalname}`);
+    probeMedia(filePath, (err, metadata) => {
+      if (!err) {
+        fileInfo.duration = Number(metadata.format.duration) || 0;
+        logger.success(`Audio metadata extracted: ${fileInfo.duration.toFixed(2)}s`);
+      }
+      logger.success(`File uploaded: ${file.originalname}`);
+      callback(fileInfo);
+    });
+  } else {
+    // Image: downscale once here so the library never decodes the
+    // full-resolution original just to show a small preview
+    logger.info(`Processing image file: ${file.originalname}`);
+    fileInfo.duration = 5; // Default 5 seconds for images
+    generateThumbnail(filePath, file.filename, IMAGE_THUMBNAIL_OPTIONS, (thumbnailPath, thumbnailData) => {
+      fileInfo.thumbnail = thumbnailPath || fileInfo.path;
+      if (thumbnailData) {
+        fileInfo.thumbnailData = thumbnailData;
+      }
+      logger.success(`File uploaded: ${file.originalname}`);
+      callback(fileInfo);
+    });
+  }
+}
+
+// Video thumbnails come from the frame at 1s; images keep their aspect ratio
+const VIDEO_THUMBNAIL_OPTIONS = { seek: 1, size: '320x180' };
+const IMAGE_THUMBNAIL_OPTIONS = { seek: 0, size: '320x?' };
+
+// Generate thumbnail for a video or image. The JPEG is piped back from ffmpeg
+// so it can be returned inline right away; the copy on disk is written in the
+// background and only used when a saved project is reopened.
+function generateThumbnail(inputPath, filename, options, callback) {
+  if (!HAS_FFMPEG) {
+    return callback(null, null);
   }
-});
 
-// Generate thumbnail for video
-function generateThumbnail(videoPath, filename, callback) {
   const thumbnailName = `thumb-${filename}.jpg`;
   const thumbnailPath = path.join(tempDir, thumbnailName);
+  const chunks = [];
+  let finished = false;
 
-  logger.debug(`Generating thumbnail for: ${filename}`);
-  ffmpeg(videoPath)
-    .screenshots({
-      timestamps: ['1'],
-      filename: thumbnailName,
-      folder: tempDir,
-      size: '320x180'
-    })
-    .on('end', () => {
-      logger.success(`Thumbnail generated: ${thumbnailName}`);
-      callback(`/temp/${thumbnailName}`);
-    })
-    .on('error', (err) => {
+  const finish = (err) => {
+    if (finished) return;
+    finished = true;
+
+    const data = Buffer.concat(chunks);
+    if (err || data.length === 0) {
       logger.error('Thumbnail generation error', err);
-      callback(null);
+      return callback(null, null);
+    }
+
+    fs.writeFile(thumbnailPath, data, (writeErr) => {
+      if (writeErr) {
+        logger.warn(`Could not save thumbnail ${thumbnailName}: ${writeErr.message}`);
+      }
     });
+    logger.success(`Thumbnail generated: ${thumbnailName}`);
+    callback(`/temp/${thumbnailName}`, `data:image/jpeg;base64,${data.toString('base64')}`);
+  };
+
+  logger.debug(`Generating thumbnail for: ${filename}`);
+  const command = ffmpeg(inputPath).inputOptions(QUIET_FFMPEG_OPTIONS);
+  if (options.seek) {
+    command.seekInput(options.seek);
+  }
+  command
+    .frames(1)
+    .size(options.size)
+    .videoCodec('mjpeg')
+    .format('image2pipe')
+    .on('error', (err) => finish(err));
+
+  command.pipe()
+    .on('data', (chunk) => chunks.push(chunk))
+    .on('end', () => finish(null));
 }
 
 // Get media info
 app.post('/api/media/info', (req, res) => {
   const { filepath } = req.body;
-  const fullPath = path.join(__dirname, '..', filepath);
+  const fullPath = resolveMediaPath(filepath);
 
-  ffmpeg.ffprobe(fullPath, (err, metadata) => {
+  probeMedia(fullPath, (err, metadata) => {
     if (err) {
       return res.status(500).json({ error: err.message });
     }
@@ -236,28 +571,138 @@ app.post('/api/media/info', (req, res) => {
   });
 });
 
+// Outcome of recent export jobs, kept so a client that missed the Socket.io
+// event (e.g. it reconnected mid-render) can still look the result up
+const exportJobs = new Map();
+const EXPORT_JOB_TTL_MS = 60 * 60 * 1000;
+
+function setExportJob(jobId, job) {
+  exportJobs.set(jobId, job);
+  if (job.status !== 'running') {
+    setTimeout(() => exportJobs.delete(jobId), EXPORT_JOB_TTL_MS).unref();
+  }
+}
+
+// Renders in progress, keyed by export key, with every job ID waiting on
+// each one, so identical exports share a single ffmpeg run
+const activeRenders = new Map();
+
+// Job IDs are chosen by the client so it knows the ID before any Socket.io
+// event for the job can arrive
+function isValidJobId(jobId) {
+  return typeof jobId === 'string' && /^[a-zA-Z0-9_-]{1,64}$/.test(jobId);
+}
+
 // Export video
 app.post('/api/export', (req, res) => {
   const { clips, settings } = req.body;
-  const outputFilename = `export-${uuidv4()}.mp4`;
-  const outputPath = path.join(tempDir, outputFilename);
 
-  try {
-    exportVideo(clips, settings, outputPath, (error, result) => {
-      if (error) {
-        return res.status(500).json({ error: error.message });
+  // Tool availability is detected once at startup, so this check is free
+  if (!HAS_FFMPEG) {
+    return res.status(503).json({ error: 'FFmpeg is not installed on the server' });
+  }
+
+  if (!clips || !clips.some(c => c.type === 'video' || c.type === 'image')) {
+    return res.status(400).json({ error: 'No video clips to export' });
+  }
+
+  const jobId = isValidJobId(req.body.jobId) ? req.body.jobId : uuidv4();
+  if (exportJobs.has(jobId)) {
+    return res.status(409).json({ error: 'Export job already exists' });
+  }
+  setExportJob(jobId, { status: 'running' });
+
+  getExportKey(clips, settings, (key) => {
+    const outputFilename = `export-${key}.mp4`;
+    const outputPath = path.join(tempDir, outputFilename);
+    const resultFor = (id) => ({
+      jobId: id,
+      path: `/temp/${outputFilename}`,
+      filename: outputFilename
+    });
+
+    fs.access(outputPath, (missing) => {
+      // An identical timeline over unchanged sources was already rendered
+      if (!missing) {
+        logger.info(`Reusing previous export: ${outputFilename}`);
+        setExportJob(jobId, { status: 'complete', ...resultFor(jobId) });
+        return res.json({ success: true, ...resultFor(jobId) });
+      }
+
+      // Render in the background and report the result over Socket.io, so the
+      // request returns immediately and the editor stays usable during encoding
+      res.status(202).json({ success: true, jobId });
+
+      // The same export is already rendering, so wait for that result
+      const waiting = activeRenders.get(key);
+      if (waiting) {
+        logger.info(`Export ${outputFilename} already rendering, job ${jobId} will share it`);
+        waiting.push(jobId);
+        return;
+      }
+
+      const jobIds = [jobId];
+      activeRenders.set(key, jobIds);
+
+      const finish = (error) => {
+        activeRenders.delete(key);
+        jobIds.forEach(id => {
+          if (error) {
+            setExportJob(id, { status: 'error', jobId: id, error: error.message });
+            io.emit('export-error', { jobId: id, error: error.message });
+          } else {
+            setExportJob(id, { status: 'complete', ...resultFor(id) });
+            io.emit('export-complete', resultFor(id));
+          }
+        });
+      };
+
+      // Render under a temporary name so an interrupted or failed export is
+      // never picked up as a cached result
+      const partialPath = path.join(tempDir, `export-${jobId}.part.mp4`);
+      try {
+        exportVideo(clips, settings, partialPath, (error) => {
+          if (error) {
+            fs.unlink(partialPath, () => {});
+            return finish(error);
+          }
+          fs.rename(partialPath, outputPath, (renameErr) => finish(renameErr || null));
+        });
+      } catch (error) {
+        finish(error);
       }
-      res.json({
-        success: true,
-        path: `/temp/${outputFilename}`,
-        filename: outputFilename
-      });
     });
-  } catch (error) {
-    res.status(500).json({ error: error.message });
+  });
+});
+
+// Look up an export job, for clients that may have missed its result event
+app.get('/api/export/:jobId', (req, res) => {
+  const job = exportJobs.get(req.params.jobId);
+  if (!job) {
+    return res.status(404).json({ error: 'Export job not found' });
   }
+  res.json(job);
 });
 
+// Derive an export filename from everything that affects the rendered
+// output: the clip list, the encode settings, the selected video encoder and
+// each source's size and modification time
+function getExportKey(clips, settings, callback) {
+  const sources = [...new Set(clips.map(c => c.path))];
+
+  runWithConcurrency(sources, MAX_MEDIA_WORKERS, (source, done) => {
+    fs.stat(resolveMediaPath(source), (err, stats) => {
+      done(err ? null : `${stats.size}:${stats.mtimeMs}`);
+    });
+  }, (results) => {
+    const { filename, ...renderSettings } = settings || {};
+    const hash = crypto.createHash('sha1')
+      .update(JSON.stringify({ clips, settings: renderSettings, encoder: videoEncoder, sources: results }))
+      .digest('hex');
+    callback(hash.slice(0, 16));
+  });
+}
+
 // Export video function
 function exportVideo(clips, settings, outputPath, callback) {
   if (!clips || clips.length === 0) {
@@ -283,25 +728,53 @@ function exportVideo(clips, settings, outputPath, callback) {
   logger.info(`Using quality settings: ${qualitySettings.resolution}, CRF: ${qualitySettings.crf}`);
   logger.info(`Exporting ${videoClips.length} video clips and ${audioClips.length} audio clips`);
 
-  // For simple case: single video clip with trim and no additional audio
-  if (videoClips.length === 1 && audioClips.length === 0 && videoClips[0].type === 'video') {
-    const clip = videoClips[0];
-    const inputPath = path.join(__dirname, '..', clip.path);
+  const reencode = () => {
+    // For simple case: single video clip with trim and no additional audio
+    if (videoClips.length === 1 && audioClips.length === 0 && videoClips[0].type === 'video') {
+      exportSingleClip(videoClips[0], qualitySettings, outputPath, callback);
+    } else {
+      // Multiple clips or audio mixing - need complex processing
+      exportMultipleClips(videoClips, audioClips, settings, outputPath, callback);
+    }
+  };
+
+  // Fast export only applies to plain video clips without extra audio tracks
+  if (!settings.fastExport || audioClips.length > 0 || videoClips.some(c => c.type !== 'video')) {
+    return reencode();
+  }
+
+  canStreamCopy(videoClips, (eligible) => {
+    if (eligible) {
+      return exportStreamCopy(videoClips, outputPath, callback);
+    }
+    logger.warn('Fast export needs matching H.264 sources; re-encoding instead');
+    reencode();
+  });
+}
+
+// Export a single trimmed clip
+function exportSingleClip(clip, qualitySettings, outputPath, callback) {
+  const inputPath = resolveMediaPath(clip.path);
+
+  logger.info(`Simple export: single clip from ${clip.trimStart}s to ${clip.trimEnd}s`);
 
-    logger.info(`Simple export: single clip from ${clip.trimStart}s to ${clip.trimEnd}s`);
+  // AAC source audio is already in the output codec, so copy it instead of
+  // decoding and re-encoding it (a second lossy pass)
+  probeMedia(inputPath, (probeErr, metadata) => {
+    const audioStream = !probeErr && metadata.streams.find(s => s.codec_type === 'audio');
+    const copyAudio = Boolean(audioStream) && audioStream.codec_name === 'aac';
 
+    // Seek on the input so ffmpeg jumps to the nearest keyframe instead of
+    // decoding and discarding everything before the trim point
     const command = ffmpeg()
       .input(inputPath)
-      .setStartTime(clip.trimStart || 0)
+      .seekInput(clip.trimStart || 0)
       .setDuration(clip.duration || (clip.trimEnd - clip.trimStart));
 
     // Apply quality settings
     const outputOptions = [
-      '-c:v libx264',
-      '-preset fast',
-      `-crf ${qualitySettings.crf}`,
-      '-c:a aac',
-      '-b:a 192k'
+      ...videoEncodeOptions(qualitySettings.crf),
+      ...(copyAudio ? AUDIO_COPY_OPTIONS : AUDIO_ENCODE_OPTIONS)
     ];
 
     // Apply resolution scaling if specified
@@ -330,214 +803,327 @@ function exportVideo(clips, settings, outputPath, callback) {
         callback(err);
       })
       .run();
-  } else {
-    // Multiple clips or audio mixing - need complex processing
-    exportMultipleClips(clips, videoClips, audioClips, settings, outputPath, callback);
+  });
+}
+
+// Stream copy is possible when every source is H.264 and the streams agree
+// on every parameter the concat demuxer can't reconcile without re-encoding:
+// profile, frame size, pixel format, frame rate and time base for video, and
+// codec, sample rate and channel count for audio (or no audio at all)
+function canStreamCopy(videoClips, callback) {
+  const sources = [...new Set(videoClips.map(c => c.path))];
+
+  runWithConcurrency(sources, MAX_MEDIA_WORKERS, (source, done) => {
+    probeMedia(resolveMediaPath(source), (err, metadata) => done(err ? null : metadata));
+  }, (results) => {
+    const signatures = results.map(metadata => {
+      if (!metadata) return null;
+      const video = metadata.streams.find(s => s.codec_type === 'video');
+      const audio = metadata.streams.find(s => s.codec_type === 'audio');
+      if (!video || video.codec_name !== 'h264') return null;
+      return JSON.stringify([
+        video.profile, video.width, video.height, video.pix_fmt,
+        video.r_frame_rate, video.time_base,
+        audio ? [audio.codec_name, audio.sample_rate, audio.channels] : null
+      ]);
+    });
+
+    callback(signatures[0] !== null && signatures.every(sig => sig === signatures[0]));
+  });
+}
+
+// Cut and join the sources with the concat demuxer's inpoint/outpoint
+// directives and copy the streams straight into the output, skipping both
+// decode and encode. Cuts snap to the nearest preceding keyframe. The list
+// is encoded once and fed to ffmpeg over stdin as a single chunk rather than
+// written to a temp file.
+function exportStreamCopy(videoClips, outputPath, callback) {
+  const fileList = videoClips.map(clip => {
+    const inputPath = resolveMediaPath(clip.path).replace(/'/g, "'\\''");
+    const inpoint = clip.trimStart || 0;
+    return `file '${inputPath}'\ninpoint ${inpoint}\noutpoint ${inpoint + getClipDuration(clip)}`;
+  }).join('\n');
+
+  logger.info(`Fast export: stream-copying ${videoClips.length} clip(s)`);
+
+  ffmpeg()
+    .input(Readable.from([Buffer.from(fileList, 'utf8')]))
+    .inputOptions(['-f concat', '-safe 0', '-protocol_whitelist file,pipe'])
+    .outputOptions(['-c copy'])
+    .output(outputPath)
+    .on('start', (cmdLine) => {
+      logger.ffmpeg(`Starting fast export: ${cmdLine}`);
+    })
+    .on('end', () => {
+      logger.success('Fast export completed successfully');
+      callback(null, { success: true });
+    })
+    .on('error', (err) => {
+      logger.error('Fast export error', err);
+      callback(err);
+    })
+    .run();
+}
+
+// Quality presets and the encoder options shared by every export path are
+// fixed, so they are built once here instead of on every export
+const QUALITY_PRESETS = {
+  high: { resolution: '1080p', scale: '1920:1080', crf: 18 },
+  medium: { resolution: '720p', scale: '1280:720', crf: 22 },
+  low: { resolution: '480p', scale: '854:480', crf: 26 },
+  original: { resolution: '1080p', scale: null, crf: 22 }  // Keep original resolution
+};
+const AUDIO_ENCODE_OPTIONS = ['-c:a aac', '-b:a 192k'];
+const AUDIO_COPY_OPTIONS = ['-c:a copy'];
+
+// H.264 encoders and their options for a given CRF-style quality. Hardware
+// encoders are preferred when one actually works on this machine; libx264
+// is used otherwise.
+const SOFTWARE_ENCODER = 'libx264';
+const VIDEO_ENCODERS = {
+  libx264: crf => ['-c:v libx264', '-preset fast', `-crf ${crf}`],
+  h264_nvenc: crf => ['-c:v h264_nvenc', '-preset p4', '-tune hq', '-rc vbr', `-cq ${crf}`, '-b:v 0'],
+  h264_videotoolbox: crf => ['-c:v h264_videotoolbox', `-q:v ${Math.max(1, 100 - crf * 2)}`]
+};
+const HARDWARE_ENCODER_PREFERENCE = ['h264_nvenc', 'h264_videotoolbox'];
+let videoEncoder = SOFTWARE_ENCODER;
+
+// Pick the video encoder once at startup. LMM_VIDEO_ENCODER forces a
+// specific encoder from VIDEO_ENCODERS.
+function detectVideoEncoder() {
+  const override = process.env.LMM_VIDEO_ENCODER;
+  if (override) {
+    if (Object.prototype.hasOwnProperty.call(VIDEO_ENCODERS, override)) {
+      videoEncoder = override;
+      logger.info(`Using video encoder from LMM_VIDEO_ENCODER: ${override}`);
+    } else {
+      logger.warn(`Unknown LMM_VIDEO_ENCODER "${override}", ignoring`);
+    }
+    return;
   }
+
+  // Builds often include hardware encoders the machine can't run (e.g.
+  // h264_nvenc without an NVIDIA GPU), so try each candidate in order of
+  // preference and keep the first that can encode a frame
+  const tryNext = (index) => {
+    if (index >= HARDWARE_ENCODER_PREFERENCE.length) {
+      logger.info(`Using software video encoder: ${SOFTWARE_ENCODER}`);
+      return;
+    }
+    const name = HARDWARE_ENCODER_PREFERENCE[index];
+    testVideoEncoder(name, (works) => {
+      if (!works) {
+        logger.debug(`Hardware encoder unavailable: ${name}`);
+        return tryNext(index + 1);
+      }
+      videoEncoder = name;
+      logger.info(`Using hardware video encoder: ${name}`);
+    });
+  };
+  tryNext(0);
+}
+
+// Encode a single synthetic frame with the exact options exports will pass
+// to check that an encoder is usable. The frame is larger than the minimum
+// size hardware encoders accept.
+function testVideoEncoder(name, callback) {
+  ffmpeg()
+    .input('color=s=256x256')
+    .inputFormat('lavfi')
+    .inputOptions(QUIET_FFMPEG_OPTIONS)
+    .outputOptions(['-frames:v 1', '-pix_fmt yuv420p', ...VIDEO_ENCODERS[name](QUALITY_PRESETS.original.crf)])
+    .format('null')
+    .output('-')
+    .on('end', () => callback(true))
+    .on('error', () => callback(false))
+    .run();
 }
 
+function videoEncodeOptions(crf) {
+  return VIDEO_ENCODERS[videoEncoder](crf);
+}
+
+// Per-segment normalisation so every clip can be joined by the concat filter
+const SEGMENT_VIDEO_FILTER = 'setsar=1,fps=30,format=yuv420p,setpts=PTS-STARTPTS';
+const SEGMENT_AUDIO_FILTER = 'aresample=48000,aformat=channel_layouts=stereo,asetpts=PTS-STARTPTS';
+
 // Get quality settings based on quality level
 function getQualitySettings(quality) {
-  switch (quality) {
-    case 'high':
-      return {
-        resolution: '1080p',
-        scale: '1920:1080',
-        crf: 18
-      };
-    case 'medium':
-      return {
-        resolution: '720p',
-        scale: '1280:720',
-        crf: 22
-      };
-    case 'low':
-      return {
-        resolution: '480p',
-        scale: '854:480',
-        crf: 26
-      };
-    default:
-      return {
-        resolution: '1080p',
-        scale: null,  // Keep original resolution
-        crf: 22
-      };
-  }
+  return Object.prototype.hasOwnProperty.call(QUALITY_PRESETS, quality)
+    ? QUALITY_PRESETS[quality]
+    : QUALITY_PRESETS.original;
 }
 
-// Export multiple clips
-function exportMultipleClips(allClips, videoClips, audioClips, settings, outputPath, callback) {
-  const processedClips = [];
-
+// Export multiple clips in a single ffmpeg pass: every source is opened once
+// as a trimmed input and the timeline is assembled in one filter graph that
+// feeds the encoder directly, with no per-clip intermediate files
+function exportMultipleClips(videoClips, audioClips, settings, outputPath, callback) {
   logger.info(`Processing ${videoClips.length} video clips and ${audioClips.length} audio clips`);
 
-  // Get quality settings
   const qualitySettings = getQualitySettings(settings.quality);
 
-  // Process each video clip: trim and normalize
-  let processed = 0;
-  const totalClips = videoClips.length;
-
-  if (totalClips === 0) {
+  if (videoClips.length === 0) {
     return callback(new Error('No video clips to process'));
   }
 
-  videoClips.forEach((clip, index) => {
-    const inputPath = path.join(__dirname, '..', clip.path);
-    const tempClipPath = path.join(tempDir, `clip-${index}-${uuidv4()}.mp4`);
+  probeClipStreams(videoClips, (hasAudio, frameSizes) => {
+    // Concatenated segments must share one frame size; exports at the
+    // original resolution use the first video clip's size
+    const frameSize = qualitySettings.scale || frameSizes.find(Boolean) || '1920:1080';
+    const command = ffmpeg();
+    const filters = [];
+    const segments = [];
+    let totalDuration = 0;
+
+    // Video track: trim each source at the input and normalise it for concat
+    videoClips.forEach((clip, index) => {
+      const inputPath = resolveMediaPath(clip.path);
+      const duration = getClipDuration(clip);
+      totalDuration += duration;
+
+      if (clip.type === 'image') {
+        command.input(inputPath).inputOptions(['-loop 1', `-t ${duration}`]);
+      } else {
+        command.input(inputPath).inputOptions([`-ss ${clip.trimStart || 0}`, `-t ${duration}`]);
+      }
 
-    logger.debug(`Processing clip ${index + 1}/${totalClips}: ${clip.path}`);
+      filters.push(`[${index}:v]scale=${frameSize}:force_original_aspect_ratio=decrease,` +
+        `pad=${frameSize}:(ow-iw)/2:(oh-ih)/2,${SEGMENT_VIDEO_FILTER}[v${index}]`);
 
-    const cmd = ffmpeg(inputPath);
+      if (hasAudio[index]) {
+        filters.push(`[${index}:a]${SEGMENT_AUDIO_FILTER}[a${index}]`);
+      } else {
+        filters.push(`anullsrc=r=48000:cl=stereo,atrim=duration=${duration}[a${index}]`);
+      }
+      segments.push(`[v${index}][a${index}]`);
+    });
 
-    // Use trimStart and trimEnd for accurate trimming
-    if (clip.trimStart !== undefined) {
-      cmd.setStartTime(clip.trimStart);
-    }
-    if (clip.duration !== undefined) {
-      cmd.setDuration(clip.duration);
-    } else if (clip.trimEnd !== undefined && clip.trimStart !== undefined) {
-      cmd.setDuration(clip.trimEnd - clip.trimStart);
-    }
+    filters.push(`${segments.join('')}concat=n=${videoClips.length}:v=1:a=1[vout][vaudio]`);
 
-    const outputOptions = [
-      '-c:v libx264',
-      '-preset ultrafast',
-      '-c:a aac',
-      '-b:a 192k',
-      '-ar 48000'
-    ];
+    // Audio tracks: -itsoffset shifts each input to its timeline position and
+    // aresample fills the lead-in with silence from t=0, avoiding a per-input
+    // adelay buffer sized to the clip's start time
+    let audioOutput = '[vaudio]';
+    if (audioClips.length > 0) {
+      logger.info(`Adding ${audioClips.length} audio tracks to mix`);
+      const mixInputs = ['[vaudio]'];
+
+      audioClips.forEach((audioClip, i) => {
+        const inputIndex = videoClips.length + i;
+        const audioPath = resolveMediaPath(audioClip.path);
+
+        command.input(audioPath).inputOptions([
+          `-itsoffset ${audioClip.timelineStart || 0}`,
+          `-ss ${audioClip.trimStart || 0}`,
+          `-t ${getClipDuration(audioClip)}`
+        ]);
+        filters.push(`[${inputIndex}:a]aresample=async=1:first_pts=0[d${i}]`);
+        mixInputs.push(`[d${i}]`);
+      });
 
-    // Apply resolution scaling to normalize all clips
-    if (qualitySettings.scale) {
-      outputOptions.push(`-vf scale=${qualitySettings.scale}:force_original_aspect_ratio=decrease,pad=${qualitySettings.scale}:(ow-iw)/2:(oh-ih)/2`);
+      filters.push(`${mixInputs.join('')}amix=inputs=${mixInputs.length}:duration=longest:dropout_transition=2[aout]`);
+      audioOutput = '[aout]';
+    } else {
+      logger.info('No additional audio tracks, using video audio only');
     }
 
-    cmd
-      .outputOptions(outputOptions)
-      .output(tempClipPath)
+    command
+      .complexFilter(filters)
+      .outputOptions([
+        '-map [vout]',
+        `-map ${audioOutput}`,
+        ...videoEncodeOptions(qualitySettings.crf),
+        ...AUDIO_ENCODE_OPTIONS,
+        '-ar 48000'
+      ])
+      .output(outputPath)
       .on('start', (cmdLine) => {
-        logger.debug(`Processing clip ${index + 1}: ${cmdLine}`);
+        logger.ffmpeg(`Starting single-pass export: ${cmdLine}`);
       })
-      .on('end', () => {
-        processedClips[index] = {
-          path: tempClipPath,
-          timelineStart: clip.timelineStart,
-          duration: clip.duration
-        };
-        processed++;
-        logger.debug(`Processed clip ${processed}/${totalClips}`);
-
-        if (processed === totalClips) {
-          // All clips processed, now concatenate with audio mixing
-          concatenateClips(processedClips, audioClips, settings, outputPath, callback);
+      .on('progress', (progress) => {
+        const percent = Math.min(100, timemarkToSeconds(progress.timemark) / totalDuration * 100);
+        if (percent > 0) {
+          io.emit('export-progress', { percent });
         }
       })
+      .on('end', () => {
+        logger.success('Video export completed successfully');
+        callback(null, { success: true });
+      })
       .on('error', (err) => {
-        logger.error(`Clip processing error for clip ${index + 1}`, err);
+        logger.error('Export error', err);
         callback(err);
       })
       .run();
   });
 }
 
-// Concatenate clips with audio mixing
-function concatenateClips(processedClips, audioClips, settings, outputPath, callback) {
-  const concatFile = path.join(tempDir, `concat-${uuidv4()}.txt`);
-
-  // Extract just the paths for concatenation
-  const clipPaths = processedClips.map(c => c.path);
-  const fileList = clipPaths.map(p => `file '${p}'`).join('\n');
-
-  fs.writeFileSync(concatFile, fileList);
-  logger.info('Created concat file for video clips');
-
-  const qualitySettings = getQualitySettings(settings.quality);
-  const command = ffmpeg();
-
-  // Add video input (concatenated)
-  command.input(concatFile).inputOptions(['-f concat', '-safe 0']);
+// Length of a clip on the timeline
+function getClipDuration(clip) {
+  if (clip.duration !== undefined) {
+    return clip.duration;
+  }
+  return (clip.trimEnd || 0) - (clip.trimStart || 0);
+}
 
-  // Add audio track inputs
-  if (audioClips && audioClips.length > 0) {
-    logger.info(`Adding ${audioClips.length} audio tracks to mix`);
-    audioClips.forEach((audioClip, index) => {
-      const audioPath = path.join(__dirname, '..', audioClip.path);
-      command.input(audioPath);
+// Convert an ffmpeg "HH:MM:SS.xx" timemark to seconds
+function timemarkToSeconds(timemark) {
+  if (!timemark) return 0;
+  return timemark.split(':').reduce((total, part) => total * 60 + parseFloat(part), 0);
+}
 
-      // Set start time and duration for audio clips
-      if (audioClip.start !== undefined) {
-        command.inputOptions(`-ss ${audioClip.start}`);
-      }
-      if (audioClip.duration !== undefined) {
-        command.inputOptions(`-t ${audioClip.duration}`);
+// Work out which video-track clips carry an audio stream, so silent sources
+// get generated silence in the concat graph, and each clip's displayed frame
+// size as "w:h" (null for images and unprobeable sources). Each distinct
+// source is probed once, in parallel; sources that cannot be probed are
+// assumed to have audio.
+function probeClipStreams(clips, callback) {
+  const sources = [...new Set(clips.filter(c => c.type !== 'image').map(c => c.path))];
+
+  runWithConcurrency(sources, MAX_MEDIA_WORKERS, (source, done) => {
+    probeMedia(resolveMediaPath(source), (err, metadata) => {
+      if (err) {
+        return done({ hasAudio: true, frameSize: null });
       }
+      const video = metadata.streams.find(s => s.codec_type === 'video');
+      done({
+        hasAudio: metadata.streams.some(s => s.codec_type === 'audio'),
+        frameSize: video ? getDisplayFrameSize(video) : null
+      });
     });
+  }, (results) => {
+    const sourceInfo = new Map(sources.map((source, i) => [source, results[i]]));
+    const info = clips.map(clip => clip.type !== 'image' ? sourceInfo.get(clip.path) : null);
+    callback(
+      info.map(entry => Boolean(entry && entry.hasAudio)),
+      info.map(entry => entry && entry.frameSize)
+    );
+  });
+}
 
-    // Build filter complex for audio mixing
-    let filterComplex = '';
-    const audioInputs = audioClips.map((_, i) => `[${i + 1}:a]`).join('');
-
-    if (audioClips.length > 0) {
-      // Mix audio from video with additional audio tracks
-      filterComplex = `[0:a]${audioInputs}amix=inputs=${audioClips.length + 1}:duration=longest:dropout_transition=2[aout]`;
-      command.complexFilter(filterComplex);
-      command.outputOptions('-map 0:v');  // Map video from concat
-      command.outputOptions('-map [aout]');  // Map mixed audio
-    }
-  } else {
-    // No additional audio tracks, just use video audio
-    logger.info('No additional audio tracks, using video audio only');
-  }
-
-  const outputOptions = [
-    '-c:v copy',  // Copy video codec from processed clips
-    '-c:a aac',
-    '-b:a 192k',
-    '-ar 48000'  // Sample rate
-  ];
+// Frame size of a video stream as ffmpeg outputs it, i.e. after applying
+// rotation metadata, rounded down to even dimensions for yuv420p
+function getDisplayFrameSize(stream) {
+  if (!stream.width || !stream.height) return null;
 
-  command
-    .outputOptions(outputOptions)
-    .output(outputPath)
-    .on('start', (cmdLine) => {
-      logger.ffmpeg(`Concatenating with command: ${cmdLine}`);
-    })
-    .on('progress', (progress) => {
-      if (progress.percent) {
-        io.emit('export-progress', { percent: progress.percent });
-      }
-    })
-    .on('end', () => {
-      // Cleanup temp files
-      try {
-        fs.unlinkSync(concatFile);
-        clipPaths.forEach(p => {
-          try { fs.unlinkSync(p); } catch (e) {}
-        });
-      } catch (e) {
-        logger.warn('Error cleaning up temp files', e);
-      }
+  const sideData = (stream.side_data_list || []).find(d => d.rotation !== undefined);
+  const rotation = Math.abs(Number(sideData ? sideData.rotation : (stream.tags && stream.tags.rotate)) || 0);
+  const rotated = rotation % 180 === 90;
+  const width = rotated ? stream.height : stream.width;
+  const height = rotated ? stream.width : stream.height;
 
-      logger.success('Concatenation and audio mixing completed');
-      callback(null, { success: true });
-    })
-    .on('error', (err) => {
-      logger.error('Concatenation error', err);
-      callback(err);
-    })
-    .run();
+  return `${width - (width % 2)}:${height - (height % 2)}`;
 }
 
 // Trim video endpoint
 app.post('/api/trim', (req, res) => {
   const { filepath, start, end } = req.body;
-  const inputPath = path.join(__dirname, '..', filepath);
+  const inputPath = resolveMediaPath(filepath);
   const outputFilename = `trimmed-${uuidv4()}.mp4`;
   const outputPath = path.join(tempDir, outputFilename);
 
   ffmpeg(inputPath)
+    .inputOptions(QUIET_FFMPEG_OPTIONS)
     .setStartTime(start)
     .setDuration(end - start)
     .output(outputPath)
@@ -570,20 +1156,21 @@ app.post('/api/project/save', (req, res) => {
       return res.status(400).json({ error: 'Invalid project ID format' });
     }
 
-    const projectsDir = path.join(__dirname, '../public/projects');
-
-    if (!fs.existsSync(projectsDir)) {
-      fs.mkdirSync(projectsDir, { recursive: true });
-    }
+    ensureDir(projectsDir);
 
     const projectFile = path.join(projectsDir, `${projectId}.json`);
-    fs.writeFileSync(projectFile, JSON.stringify(project, null, 2));
+    writeProjectFile(projectFile, JSON.stringify(project), (err) => {
+      if (err) {
+        logger.error('Project save error', err);
+        return res.status(500).json({ error: err.message });
+      }
 
-    logger.success(`Project saved: ${projectId}`);
-    res.json({
-      success: true,
-      projectId: projectId,
-      filename: `${projectId}.json`
+      logger.success(`Project saved: ${projectId}`);
+      res.json({
+        success: true,
+        projectId: projectId,
+        filename: `${projectId}.json`
+      });
     });
   } catch (error) {
     logger.error('Project save error', error);
@@ -591,6 +1178,56 @@ app.post('/api/project/save', (req, res) => {
   }
 });
 
+// Pending writes per project file. Saves are written asynchronously and one
+// at a time per file; saves that arrive while a write is in flight collapse
+// into a single follow-up write of the newest snapshot.
+const projectWrites = new Map();
+
+function writeProjectFile(projectFile, data, callback) {
+  let state = projectWrites.get(projectFile);
+  if (!state) {
+    state = { writing: false, data: null, callbacks: [] };
+    projectWrites.set(projectFile, state);
+  }
+
+  state.data = data;
+  state.callbacks.push(callback);
+  if (!state.writing) {
+    flushProjectWrite(projectFile, state);
+  }
+}
+
+function flushProjectWrite(projectFile, state) {
+  const { data, callbacks } = state;
+  state.data = null;
+  state.callbacks = [];
+  state.writing = true;
+
+  // Write to a side file and rename it over the project, so a crash or a
+  // concurrent load never sees a half-written project
+  const tempFile = `${projectFile}.tmp`;
+  fs.writeFile(tempFile, data, (writeErr) => {
+    if (writeErr) {
+      fs.unlink(tempFile, () => {});
+      return finishProjectWrite(projectFile, state, callbacks, writeErr);
+    }
+    fs.rename(tempFile, projectFile, (renameErr) => {
+      finishProjectWrite(projectFile, state, callbacks, renameErr);
+    });
+  });
+}
+
+function finishProjectWrite(projectFile, state, callbacks, err) {
+  state.writing = false;
+  callbacks.forEach(callback => callback(err));
+
+  if (state.data !== null) {
+    flushProjectWrite(projectFile, state);
+  } else {
+    projectWrites.delete(projectFile);
+  }
+}
+
 // Load project
 app.get('/api/project/load/:projectId', (req, res) => {
   try {
@@ -601,45 +1238,67 @@ app.get('/api/project/load/:projectId', (req, res) => {
       return res.status(400).json({ error: 'Invalid project ID format' });
     }
 
-    const projectsDir = path.join(__dirname, '../public/projects');
     const projectFile = path.join(projectsDir, `${projectId}.json`);
 
     if (!fs.existsSync(projectFile)) {
       return res.status(404).json({ error: 'Project not found' });
     }
 
-    const projectData = fs.readFileSync(projectFile, 'utf8');
+    const projectData = JSON.parse(fs.readFileSync(projectFile, 'utf8'));
     logger.success(`Project loaded: ${projectId}`);
-    res.json(JSON.parse(projectData));
+    res.json(projectData);
+    warmProbeCache(projectData.mediaItems);
   } catch (error) {
     logger.error('Project load error', error);
     res.status(500).json({ error: error.message });
   }
 });
 
+// Project list entries keyed by filename, reused while the file's mtime is
+// unchanged so opening the load dialog doesn't re-read and re-parse every
+// saved project
+const projectSummaries = new Map();
+
+async function readProjectSummary(file) {
+  const filePath = path.join(projectsDir, file);
+  const stats = await fs.promises.stat(filePath);
+  const cached = projectSummaries.get(file);
+  if (cached && cached.mtimeMs === stats.mtimeMs) {
+    return cached.summary;
+  }
+
+  const data = JSON.parse(await fs.promises.readFile(filePath, 'utf8'));
+  const summary = {
+    id: path.basename(file, '.json'),
+    name: data.name || 'Untitled Project',
+    created: data.created || stats.birthtime,
+    modified: stats.mtime
+  };
+  projectSummaries.set(file, { mtimeMs: stats.mtimeMs, summary });
+  return summary;
+}
+
 // List projects
-app.get('/api/project/list', (req, res) => {
+app.get('/api/project/list', async (req, res) => {
   try {
-    const projectsDir = path.join(__dirname, '../public/projects');
-
-    if (!fs.existsSync(projectsDir)) {
-      return res.json({ projects: [] });
+    let files;
+    try {
+      files = (await fs.promises.readdir(projectsDir)).filter(f => f.endsWith('.json'));
+    } catch (err) {
+      if (err.code === 'ENOENT') {
+        return res.json({ projects: [] });
+      }
+      throw err;
     }
 
-    const files = fs.readdirSync(projectsDir).filter(f => f.endsWith('.json'));
-    const projects = files.map(file => {
-      const filePath = path.join(projectsDir, file);
-      const stats = fs.statSync(filePath);
-      const data = JSON.parse(fs.readFileSync(filePath, 'utf8'));
-
-      return {
-        id: path.basename(file, '.json'),
-        name: data.name || 'Untitled Project',
-        created: data.created || stats.birthtime,
-        modified: stats.mtime
-      };
-    });
+    // Forget projects that were deleted since the last listing
+    for (const file of projectSummaries.keys()) {
+      if (!files.includes(file)) {
+        projectSummaries.delete(file);
+      }
+    }
 
+    const projects = await Promise.all(files.map(readProjectSummary));
     res.json({ projects });
   } catch (error) {
     res.status(500).json({ error: error.message });
@@ -656,7 +1315,7 @@ app.get('/api/assets/:type', (req, res) => {
       return res.status(400).json({ error: 'Invalid asset type' });
     }
 
-    const assetsFile = path.join(__dirname, '../public/assets', type, 'assets.json');
+    const assetsFile = path.join(assetsDir, type, 'assets.json');
 
     if (!fs.existsSync(assetsFile)) {
       return res.json({ assets: [] });
@@ -675,12 +1334,25 @@ app.get('/api/assets/:type', (req, res) => {
 
 // Health check
 app.get('/api/health', (req, res) => {
-  res.json({ status: 'ok', ffmpeg: true });
+  res.json({ status: 'ok', ffmpeg: HAS_FFMPEG, ffprobe: HAS_FFPROBE });
 });
 
 // Serve frontend
 app.get('/', (req, res) => {
-  res.sendFile(path.join(__dirname, '../frontend/index.html'));
+  res.sendFile(path.join(frontendDir, 'index.html'));
+});
+
+// Report upload failures (oversized files, too many files) as JSON instead
+// of Express's default HTML error page
+app.use((err, req, res, next) => {
+  if (err instanceof multer.MulterError) {
+    const status = err.code === 'LIMIT_FILE_SIZE' ? 413 : 400;
+    logger.warn(`Upload rejected: ${err.message}`);
+    return res.status(status).json({ error: err.message });
+  }
+
+  logger.error('Unhandled request error', err);
+  res.status(500).json({ error: err.message });
 });
 
 // Start server
@@ -690,5 +1362,11 @@ server.listen(PORT, () => {
   logger.info(`Environment: ${process.env.NODE_ENV || 'development'}`);
   logger.info(`Node version: ${process.version}`);
   logger.info(`Platform: ${process.platform}`);
+  if (!HAS_FFMPEG || !HAS_FFPROBE) {
+    logger.warn(`FFmpeg tools missing (ffmpeg: ${HAS_FFMPEG}, ffprobe: ${HAS_FFPROBE}); media processing will be limited`);
+  }
+  if (HAS_FFMPEG) {
+    detectVideoEncoder();
+  }
   logger.info(`Press Ctrl+C to stop the server`);
 });
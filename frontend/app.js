@@ -2,6 +2,7 @@
 class VideoEditor {
     constructor() {
         this.mediaItems = [];
+        this.mediaById = new Map(); // Media items indexed by id for constant-time lookups
         this.timelineClips = [];
         this.selectedClip = null;
         this.zoom = 1;
@@ -10,10 +11,14 @@ class VideoEditor {
         this.currentTime = 0;
         this.currentPlayingClip = null;
         this.socket = null;
+        this.exportJobId = null; // Background export this client is waiting on
         this.projectId = null;
         this.projectName = 'Untitled Project';
         this.previewQuality = 'high'; // 'low' or 'high'
         this.dragDropListenersSet = false; // Track if drag/drop listeners are set
+        this.redrawFrame = null; // Pending animation frame for a coalesced timeline redraw
+        this.saveInFlight = false; // A project save request is running
+        this.saveQueued = false; // Another save was requested while one was running
 
         // Assets for sounds, transitions, effects
         this.soundAssets = [];
@@ -75,6 +80,12 @@ class VideoEditor {
             qualityToggle: document.getElementById('qualityToggle')
         };
 
+        // Hidden second player that buffers the next clip during playback
+        this.standbyPlayer = this.elements.previewPlayer.cloneNode(false);
+        this.standbyPlayer.removeAttribute('id');
+        this.standbyPlayer.preload = 'auto';
+        this.elements.previewPlayer.after(this.standbyPlayer);
+
         this.renderTracks();
         this.setupEventListeners();
         this.setupKeyboardShortcuts();
@@ -173,13 +184,24 @@ class VideoEditor {
         });
 
         // Preview player events
-        this.elements.previewPlayer.addEventListener('timeupdate', () => this.updatePlayhead());
-        this.elements.previewPlayer.addEventListener('ended', () => this.onVideoEnded());
+        // Both players get listeners since they swap roles; only the visible one reports
+        [this.elements.previewPlayer, this.standbyPlayer].forEach(player => {
+            player.addEventListener('timeupdate', () => {
+                if (player === this.elements.previewPlayer) this.updatePlayhead();
+            });
+            player.addEventListener('ended', () => {
+                if (player === this.elements.previewPlayer) this.onVideoEnded();
+            });
+        });
 
         // Socket events
         this.socket.on('export-progress', (data) => {
             this.updateExportProgress(data.percent);
         });
+        this.socket.on('export-complete', (data) => this.onExportComplete(data));
+        this.socket.on('export-error', (data) => this.onExportError(data));
+        // Result events sent while disconnected are lost, so ask for them
+        this.socket.on('connect', () => this.checkExportStatus());
 
         // Drag and drop on media library
         this.elements.mediaLibrary.addEventListener('dragover', (e) => {
@@ -430,44 +452,89 @@ class VideoEditor {
     }
 
     async handleFileUpload(files) {
+        if (!files || files.length === 0) return;
+
+        // Must match the server's multer limits
+        const maxBatchFiles = 50;
+        const maxFileSize = 500 * 1024 * 1024;
+
         this.showLoading();
         this.log(`Starting upload of ${files.length} file(s)`, 'info');
 
+        // Oversized files would make the server abort the whole request, so
+        // they are left out here and reported on their own
+        const accepted = [];
+        const rejected = [];
         for (const file of files) {
+            if (file.size > maxFileSize) {
+                rejected.push(file.name);
+            } else {
+                accepted.push(file);
+            }
+        }
+
+        // Send files in batches so the server can process each batch together
+        for (let i = 0; i < accepted.length; i += maxBatchFiles) {
+            const batch = accepted.slice(i, i + maxBatchFiles);
             const formData = new FormData();
-            formData.append('file', file);
+            let totalSize = 0;
+            for (const file of batch) {
+                formData.append('files', file);
+                totalSize += file.size;
+            }
 
             try {
-                this.log(`Uploading: ${file.name} (${(file.size / 1024 / 1024).toFixed(2)} MB)`, 'info');
-                const response = await fetch('/api/upload', {
+                this.log(`Uploading ${batch.length} file(s) (${(totalSize / 1024 / 1024).toFixed(2)} MB)`, 'info');
+                const response = await fetch('/api/upload/batch', {
                     method: 'POST',
                     body: formData
                 });
 
+                const result = await response.json().catch(() => ({ error: 'Unknown error' }));
+                rejected.push(...(result.rejected || []));
+
                 if (response.ok) {
-                    const mediaItem = await response.json();
-                    this.addMediaItem(mediaItem);
-                    this.log(`Successfully uploaded: ${file.name}`, 'info');
-                } else {
-                    const errorData = await response.json().catch(() => ({ error: 'Unknown error' }));
-                    this.log(`Failed to upload ${file.name}: ${errorData.error || 'Unknown error'}`, 'error');
-                    this.showToast('Failed to upload: ' + file.name, 'error');
+                    this.addMediaItems(result.items);
+                    result.items.forEach(mediaItem => {
+                        this.log(`Successfully uploaded: ${mediaItem.originalName}`, 'info');
+                    });
+                } else if (!result.rejected || result.rejected.length !== batch.length) {
+                    this.log(`Failed to upload files: ${result.error || 'Unknown error'}`, 'error');
+                    this.showToast('Failed to upload files', 'error');
                 }
             } catch (error) {
-                this.log(`Upload error for ${file.name}: ${error.message}`, 'error');
+                this.log(`Upload error: ${error.message}`, 'error');
                 console.error('Upload error:', error);
-                this.showToast('Error uploading file: ' + error.message, 'error');
+                this.showToast('Error uploading files: ' + error.message, 'error');
             }
         }
 
+        if (rejected.length > 0) {
+            this.log(`Skipped unsupported or oversized file(s): ${rejected.join(', ')}`, 'warning');
+            this.showToast(`Skipped ${rejected.length} file(s): ${rejected.join(', ')}`, 'warning');
+        }
+
         this.hideLoading();
         this.elements.fileInput.value = '';
     }
 
-    addMediaItem(item) {
+    // Add a batch of uploaded items, inserting all their library entries into
+    // the DOM in one append instead of one layout per file
+    addMediaItems(items) {
         try {
-            this.mediaItems.push(item);
-            this.log(`Added media item: ${item.originalName} (Type: ${item.type}, Duration: ${item.duration}s)`, 'info');
+            const fragment = document.createDocumentFragment();
+
+            items.forEach(item => {
+                // Inline thumbnail data is only for the first render; projects keep the file path
+                const inlineThumbnail = item.thumbnailData;
+                delete item.thumbnailData;
+
+                this.mediaItems.push(item);
+                this.mediaById.set(item.id, item);
+                this.log(`Added media item: ${item.originalName} (Type: ${item.type}, Duration: ${item.duration}s)`, 'info');
+
+                fragment.appendChild(this.createMediaElement(item, inlineThumbnail || item.thumbnail || item.path));
+            });
 
             // Remove empty state if present
             const emptyState = this.elements.mediaLibrary.querySelector('.empty-state');
@@ -475,38 +542,42 @@ class VideoEditor {
                 emptyState.remove();
             }
 
-            // Create media item element
-            const mediaEl = document.createElement('div');
-            mediaEl.className = 'media-item';
-            mediaEl.draggable = true;
-            mediaEl.dataset.mediaId = item.id;
-
-            const thumbnail = item.thumbnail || item.path;
-            const duration = this.formatTime(item.duration || 0);
-
-            mediaEl.innerHTML = `
-                ${item.type === 'audio' ?
-                    `<div class="media-thumbnail" style="display: flex; align-items: center; justify-content: center; background: #2d2d2d;">
-                        <span style="font-size: 2rem;">🎵</span>
-                    </div>` :
-                    `<img src="${thumbnail}" class="media-thumbnail" alt="${item.originalName}">`
-                }
-                <div class="media-info">
-                    <div class="media-name" title="${item.originalName}">${item.originalName}</div>
-                    <div class="media-duration">${duration}</div>
-                </div>
-            `;
-
-            this.elements.mediaLibrary.appendChild(mediaEl);
+            this.elements.mediaLibrary.appendChild(fragment);
         } catch (error) {
             this.log(`Error adding media item: ${error.message}`, 'error');
             console.error('Add media item error:', error);
         }
     }
 
+    createMediaElement(item, thumbnail) {
+        const mediaEl = document.createElement('div');
+        mediaEl.className = 'media-item';
+        mediaEl.draggable = true;
+        mediaEl.dataset.mediaId = item.id;
+
+        const duration = this.formatTime(item.duration || 0);
+
+        // Thumbnails load lazily and decode off the main thread, so large
+        // libraries render immediately and fill in as items scroll into view
+        mediaEl.innerHTML = `
+            ${item.type === 'audio' ?
+                `<div class="media-thumbnail" style="display: flex; align-items: center; justify-content: center; background: #2d2d2d;">
+                    <span style="font-size: 2rem;">🎵</span>
+                </div>` :
+                `<img src="${thumbnail}" class="media-thumbnail" alt="${item.originalName}" loading="lazy" decoding="async">`
+            }
+            <div class="media-info">
+                <div class="media-name" title="${item.originalName}">${item.originalName}</div>
+                <div class="media-duration">${duration}</div>
+            </div>
+        `;
+
+        return mediaEl;
+    }
+
     addClipToTimeline(mediaId, trackId, startTime) {
         try {
-            const mediaItem = this.mediaItems.find(m => m.id === mediaId);
+            const mediaItem = this.mediaById.get(mediaId);
             if (!mediaItem) {
                 this.log(`Error: Media item not found: ${mediaId}`, 'error');
                 return;
@@ -523,7 +594,7 @@ class VideoEditor {
                 trackId: trackId
             };
 
-            this.timelineClips.push(clip);
+            this.insertClip(clip);
             this.log(`Added clip to timeline: ${mediaItem.originalName} at ${startTime.toFixed(2)}s on track ${trackId}`, 'info');
             this.renderTimelineClip(clip);
             this.updateTimelineDuration();
@@ -533,14 +604,47 @@ class VideoEditor {
         }
     }
 
-    renderTimelineClip(clip) {
-        const mediaItem = this.mediaItems.find(m => m.id === clip.mediaId);
-        if (!mediaItem) return;
+    // Insert a clip keeping timelineClips ordered by start time
+    insertClip(clip) {
+        let low = 0;
+        let high = this.timelineClips.length;
+        while (low < high) {
+            const mid = (low + high) >> 1;
+            if (this.timelineClips[mid].start <= clip.start) {
+                low = mid + 1;
+            } else {
+                high = mid;
+            }
+        }
+        this.timelineClips.splice(low, 0, clip);
+    }
 
+    // Move a clip whose start time changed back to its sorted position
+    repositionClip(clip) {
+        const index = this.timelineClips.indexOf(clip);
+        if (index !== -1) {
+            this.timelineClips.splice(index, 1);
+        }
+        this.insertClip(clip);
+    }
+
+    renderTimelineClip(clip) {
         const trackContent = document.querySelector(`[data-track-id="${clip.trackId}"].track-content`);
         if (!trackContent) return;
 
-        const clipEl = document.createElement('div');
+        const clipEl = this.createTimelineClipElement(clip);
+        if (clipEl) {
+            trackContent.appendChild(clipEl);
+        }
+    }
+
+    createTimelineClipElement(clip) {
+        const mediaItem = this.mediaById.get(clip.mediaId);
+        if (!mediaItem) return null;
+
+        // Clone a pre-parsed clip skeleton and fill in text nodes rather than
+        // running the HTML parser for every clip on every timeline rebuild
+        const clipEl = this.getClipTemplate().cloneNode(true);
         clipEl.className = `timeline-clip ${clip.type}`;
         clipEl.dataset.clipId = clip.id;
 
@@ -550,14 +654,8 @@ class VideoEditor {
         clipEl.style.width = width + 'px';
         clipEl.style.left = left + 'px';
 
-        clipEl.innerHTML = `
-            <div class="clip-content">
-                <div class="clip-name">${mediaItem.originalName}</div>
-                <div class="clip-duration">${this.formatTime(clip.duration)}</div>
-            </div>
-            <div class="clip-handle left"></div>
-            <div class="clip-handle right"></div>
-        `;
+        clipEl.querySelector('.clip-name').textContent = mediaItem.originalName;
+        clipEl.querySelector('.clip-duration').textContent = this.formatTime(clip.duration);
 
         // Click to select
         clipEl.addEventListener('click', (e) => {
@@ -576,7 +674,22 @@ class VideoEditor {
         // Make resizable
         this.makeClipResizable(clipEl, clip);
 
-        trackContent.appendChild(clipEl);
+        return clipEl;
+    }
+
+    getClipTemplate() {
+        if (!this.clipTemplate) {
+            this.clipTemplate = document.createElement('div');
+            this.clipTemplate.innerHTML = `
+                <div class="clip-content">
+                    <div class="clip-name"></div>
+                    <div class="clip-duration"></div>
+                </div>
+                <div class="clip-handle left"></div>
+                <div class="clip-handle right"></div>
+            `;
+        }
+        return this.clipTemplate;
     }
 
     makeClipDraggable(clipEl, clip) {
@@ -585,6 +698,7 @@ class VideoEditor {
         let startY = 0;
         let startLeft = 0;
         let currentTrack = null;
+        let dropTargets = [];
 
         const onMouseDown = (e) => {
             if (e.target.classList.contains('clip-handle')) return;
@@ -595,6 +709,18 @@ class VideoEditor {
             startLeft = clip.start * this.pixelsPerSecond;
             currentTrack = clip.trackId;
 
+            // Measure the tracks this clip may move to once per drag, rather
+            // than querying and measuring every track on each mousemove
+            dropTargets = Array.from(document.querySelectorAll('.track-content'))
+                .filter(trackContent => {
+                    const track = this.tracks.find(t => t.id === trackContent.dataset.trackId);
+                    return track && track.type === clip.type;
+                })
+                .map(trackContent => ({
+                    element: trackContent,
+                    rect: trackContent.getBoundingClientRect()
+                }));
+
             // Add dragging class for visual feedback
             clipEl.classList.add('dragging');
 
@@ -617,22 +743,14 @@ class VideoEditor {
             clipEl.style.left = newLeft + 'px';
 
             // Check for track change (vertical movement)
-            const trackContents = document.querySelectorAll('.track-content');
             let newTrackId = null;
 
-            trackContents.forEach(trackContent => {
-                const rect = trackContent.getBoundingClientRect();
+            dropTargets.forEach(({ element, rect }) => {
                 if (e.clientY >= rect.top && e.clientY <= rect.bottom) {
-                    const trackId = trackContent.dataset.trackId;
-                    const track = this.tracks.find(t => t.id === trackId);
-
-                    // Check if clip type matches track type
-                    if (track && track.type === clip.type) {
-                        newTrackId = trackId;
-                        trackContent.classList.add('drop-target');
-                    }
+                    newTrackId = element.dataset.trackId;
+                    element.classList.add('drop-target');
                 } else {
-                    trackContent.classList.remove('drop-target');
+                    element.classList.remove('drop-target');
                 }
             });
 
@@ -648,17 +766,25 @@ class VideoEditor {
             isDragging = false;
             clipEl.classList.remove('dragging');
 
-            // Remove drop-target class from all tracks
-            document.querySelectorAll('.track-content').forEach(tc => {
-                tc.classList.remove('drop-target');
+            if (clip.start * this.pixelsPerSecond !== startLeft) {
+                this.repositionClip(clip);
+            }
+
+            // Remove drop-target class from the candidate tracks
+            dropTargets.forEach(({ element }) => {
+                element.classList.remove('drop-target');
             });
 
-            // Update clip track if it changed
+            // Move just this clip's element if its track changed
             if (currentTrack !== clip.trackId) {
                 this.log(`Moved clip to track: ${currentTrack}`, 'info');
                 clip.trackId = currentTrack;
-                this.refreshTimeline();
+                const target = dropTargets.find(({ element }) => element.dataset.trackId === currentTrack);
+                if (target) {
+                    target.element.appendChild(clipEl);
+                }
             }
+            dropTargets = [];
 
             document.removeEventListener('mousemove', onMouseMove);
             document.removeEventListener('mouseup', onMouseUp);
@@ -696,7 +822,7 @@ class VideoEditor {
             if (!isResizing) return;
 
             const deltaX = e.clientX - startX;
-            const mediaItem = this.mediaItems.find(m => m.id === clip.mediaId);
+            const mediaItem = this.mediaById.get(clip.mediaId);
             const maxDuration = mediaItem ? mediaItem.duration : clip.duration;
 
             if (resizeType === 'right') {
@@ -731,6 +857,9 @@ class VideoEditor {
         };
 
         const onMouseUp = () => {
+            if (resizeType === 'left') {
+                this.repositionClip(clip);
+            }
             isResizing = false;
             resizeType = null;
             document.removeEventListener('mousemove', onMouseMove);
@@ -776,7 +905,7 @@ class VideoEditor {
         }
 
         const clip = this.selectedClip;
-        const mediaItem = this.mediaItems.find(m => m.id === clip.mediaId);
+        const mediaItem = this.mediaById.get(clip.mediaId);
 
         this.elements.propertiesContent.innerHTML = `
             <div class="property-group">
@@ -820,6 +949,7 @@ class VideoEditor {
         // Add event listeners for property changes
         document.getElementById('clipStart').addEventListener('change', (e) => {
             clip.start = parseFloat(e.target.value);
+            this.repositionClip(clip);
             this.refreshTimeline();
         });
 
@@ -843,14 +973,25 @@ class VideoEditor {
     }
 
     refreshTimeline() {
-        // Clear all track contents
+        // Build each track's clips off-document, then swap them in with a
+        // single DOM update per track instead of one insertion per clip
+        const fragments = new Map();
         document.querySelectorAll('.track-content').forEach(track => {
-            track.innerHTML = '';
+            fragments.set(track.dataset.trackId, document.createDocumentFragment());
         });
 
-        // Redraw all clips
         this.timelineClips.forEach(clip => {
-            this.renderTimelineClip(clip);
+            const fragment = fragments.get(clip.trackId);
+            if (!fragment) return;
+
+            const clipEl = this.createTimelineClipElement(clip);
+            if (clipEl) {
+                fragment.appendChild(clipEl);
+            }
+        });
+
+        document.querySelectorAll('.track-content').forEach(track => {
+            track.replaceChildren(fragments.get(track.dataset.trackId));
         });
 
         this.updateTimelineDuration();
@@ -892,7 +1033,7 @@ class VideoEditor {
         clip.trimEnd = clip.trimStart + splitPoint;
 
         // Add new clip
-        this.timelineClips.push(newClip);
+        this.insertClip(newClip);
 
         // Refresh
         this.refreshTimeline();
@@ -936,7 +1077,7 @@ class VideoEditor {
             start: pasteTime
         };
 
-        this.timelineClips.push(newClip);
+        this.insertClip(newClip);
         this.renderTimelineClip(newClip);
         this.selectClip(newClip.id);
         this.updateTimelineDuration();
@@ -961,7 +1102,7 @@ class VideoEditor {
             start: clip.start + clip.duration + 0.1 // Offset slightly
         };
 
-        this.timelineClips.push(newClip);
+        this.insertClip(newClip);
         this.renderTimelineClip(newClip);
         this.selectClip(newClip.id);
         this.updateTimelineDuration();
@@ -985,10 +1126,8 @@ class VideoEditor {
             return;
         }
 
-        // Get sorted video clips by timeline start position
-        const videoClips = this.timelineClips
-            .filter(c => c.type === 'video')
-            .sort((a, b) => a.start - b.start);
+        // timelineClips is kept ordered by start time, so filtering preserves order
+        const videoClips = this.timelineClips.filter(c => c.type === 'video');
 
         if (videoClips.length === 0) {
             this.showToast('Add video clips to the timeline first', 'warning');
@@ -1014,7 +1153,7 @@ class VideoEditor {
     }
 
     playClip(clip) {
-        const mediaItem = this.mediaItems.find(m => m.id === clip.mediaId);
+        const mediaItem = this.mediaById.get(clip.mediaId);
         if (!mediaItem) {
             this.log('Error: Media item not found for clip', 'error');
             return;
@@ -1024,7 +1163,13 @@ class VideoEditor {
         const timeInClip = this.currentTime - clip.start;
         const videoTime = clip.trimStart + timeInClip;
 
-        this.elements.previewPlayer.src = mediaItem.path;
+        if (this.standbyPlayer.dataset.clipId === clip.id) {
+            // The standby player already buffered this clip: swap it in
+            // instead of tearing down and reloading the visible player
+            this.swapPreviewPlayers();
+        } else {
+            this.elements.previewPlayer.src = mediaItem.path;
+        }
         this.elements.previewPlayer.currentTime = videoTime;
         this.elements.previewPlayer.classList.add('active');
 
@@ -1035,6 +1180,39 @@ class VideoEditor {
             this.log(`Playback error: ${err.message}`, 'error');
             this.isPlaying = false;
         });
+
+        this.preloadNextClip(clip);
+    }
+
+    swapPreviewPlayers() {
+        const current = this.elements.previewPlayer;
+        const next = this.standbyPlayer;
+
+        current.pause();
+        next.volume = current.volume;
+        next.muted = current.muted;
+
+        current.classList.remove('active');
+        next.classList.add('active');
+        delete next.dataset.clipId;
+
+        this.elements.previewPlayer = next;
+        this.standbyPlayer = current;
+    }
+
+    preloadNextClip(clip) {
+        const nextClip = this.timelineClips.find(c => c.type === 'video' && c.start > clip.start);
+        const mediaItem = nextClip && this.mediaById.get(nextClip.mediaId);
+        if (!mediaItem) {
+            delete this.standbyPlayer.dataset.clipId;
+            return;
+        }
+
+        if (this.standbyPlayer.getAttribute('src') !== mediaItem.path) {
+            this.standbyPlayer.src = mediaItem.path;
+        }
+        this.standbyPlayer.currentTime = nextClip.trimStart;
+        this.standbyPlayer.dataset.clipId = nextClip.id;
     }
 
     pause() {
@@ -1082,13 +1260,11 @@ class VideoEditor {
     }
 
     playNextClip() {
-        // Get all video clips sorted by timeline position
-        const videoClips = this.timelineClips
-            .filter(c => c.type === 'video')
-            .sort((a, b) => a.start - b.start);
-
-        // Find next clip after current position
-        const nextClip = videoClips.find(clip => clip.start > this.currentTime);
+        // Find next clip after current position; timelineClips is already
+        // ordered by start time, so the first match is the next clip
+        const nextClip = this.timelineClips.find(clip =>
+            clip.type === 'video' && clip.start > this.currentTime
+        );
 
         if (nextClip) {
             this.currentTime = nextClip.start;
@@ -1109,8 +1285,19 @@ class VideoEditor {
     zoomTimeline(factor) {
         this.zoom *= factor;
         this.pixelsPerSecond *= factor;
-        this.refreshTimeline();
-        this.drawTimelineRuler();
+        this.scheduleTimelineRedraw();
+    }
+
+    // Coalesce bursts of redraw requests (e.g. key-repeat zooming) into a
+    // single timeline and ruler rebuild per animation frame
+    scheduleTimelineRedraw() {
+        if (this.redrawFrame) return;
+
+        this.redrawFrame = requestAnimationFrame(() => {
+            this.redrawFrame = null;
+            this.refreshTimeline();
+            this.drawTimelineRuler();
+        });
     }
 
     drawTimelineRuler() {
@@ -1157,6 +1344,7 @@ class VideoEditor {
     newProject() {
         if (confirm('Start a new project? This will clear all media and timeline clips.')) {
             this.mediaItems = [];
+            this.mediaById.clear();
             this.timelineClips = [];
             this.selectedClip = null;
 
@@ -1193,39 +1381,41 @@ class VideoEditor {
         const filename = document.getElementById('exportFilename').value || 'my-video';
         const format = document.getElementById('exportFormat').value;
         const quality = document.getElementById('exportQuality').value;
+        const fastExport = document.getElementById('exportFastMode').checked;
 
         document.getElementById('exportProgress').style.display = 'block';
         document.getElementById('startExport').disabled = true;
 
         this.log('Starting video export...', 'info');
 
-        // Sort clips by timeline position and prepare data
-        const sortedClips = this.timelineClips
-            .sort((a, b) => {
-                // Sort by track type first (video before audio), then by timeline position
-                if (a.type !== b.type) {
-                    return a.type === 'video' ? -1 : 1;
-                }
-                return a.start - b.start;
-            })
-            .map(clip => {
-                const mediaItem = this.mediaItems.find(m => m.id === clip.mediaId);
-                if (!mediaItem) {
-                    this.log(`Warning: Media item not found for clip ${clip.id}`, 'warning');
-                }
-                return {
-                    path: mediaItem ? mediaItem.path : '',
-                    type: clip.type,
-                    trimStart: clip.trimStart,
-                    trimEnd: clip.trimEnd,
-                    duration: clip.duration,
-                    timelineStart: clip.start,
-                    trackId: clip.trackId
-                };
-            });
+        // timelineClips is kept ordered by start time, so grouping by type
+        // (video before audio) preserves timeline order within each group
+        const orderedClips = [
+            ...this.timelineClips.filter(c => c.type === 'video'),
+            ...this.timelineClips.filter(c => c.type !== 'video')
+        ];
+        const sortedClips = orderedClips.map(clip => {
+            const mediaItem = this.mediaById.get(clip.mediaId);
+            if (!mediaItem) {
+                this.log(`Warning: Media item not found for clip ${clip.id}`, 'warning');
+            }
+            return {
+                path: mediaItem ? mediaItem.path : '',
+                type: clip.type,
+                trimStart: clip.trimStart,
+                trimEnd: clip.trimEnd,
+                duration: clip.duration,
+                timelineStart: clip.start,
+                trackId: clip.trackId
+            };
+        });
 
         this.log(`Exporting ${sortedClips.length} clips (${sortedClips.filter(c => c.type === 'video').length} video, ${sortedClips.filter(c => c.type === 'audio').length} audio)`, 'info');
 
+        // Pick the job id before sending, so result events that arrive
+        // ahead of the HTTP response still match this export
+        this.exportJobId = this.generateId();
+
         try {
             const response = await fetch('/api/export', {
                 method: 'POST',
@@ -1233,42 +1423,94 @@ class VideoEditor {
                     'Content-Type': 'application/json'
                 },
                 body: JSON.stringify({
+                    jobId: this.exportJobId,
                     clips: sortedClips,
                     settings: {
                         format: format,
                         quality: quality,
-                        filename: filename
+                        filename: filename,
+                        fastExport: fastExport
                     }
                 })
             });
 
             if (response.ok) {
+                // The server renders in the background and reports back over
+                // Socket.io, so editing can continue while the export runs
                 const result = await response.json();
-
-                // Download the file
-                const link = document.createElement('a');
-                link.href = result.path;
-                link.download = result.filename;
-                link.click();
-
-                this.log('Video exported successfully!', 'info');
-                this.showToast('Video exported successfully!', 'success');
-                this.hideExportModal();
+                if (result.path) {
+                    // Unchanged timeline: the previous render was reused
+                    this.onExportComplete(result);
+                } else {
+                    this.log(`Export started (job ${result.jobId})`, 'info');
+                }
             } else {
                 const error = await response.json();
                 this.log(`Export failed: ${error.error}`, 'error');
                 this.showToast('Export failed: ' + error.error, 'error');
+                this.finishExport();
             }
         } catch (error) {
             this.log(`Export error: ${error.message}`, 'error');
             console.error('Export error:', error);
             this.showToast('Export failed: ' + error.message, 'error');
-        } finally {
-            document.getElementById('exportProgress').style.display = 'none';
-            document.getElementById('startExport').disabled = false;
+            this.finishExport();
         }
     }
 
+    onExportComplete(result) {
+        if (result.jobId !== this.exportJobId) return;
+
+        // Download the file
+        const link = document.createElement('a');
+        link.href = result.path;
+        link.download = result.filename;
+        link.click();
+
+        this.log('Video exported successfully!', 'info');
+        this.showToast('Video exported successfully!', 'success');
+        this.hideExportModal();
+        this.finishExport();
+    }
+
+    async checkExportStatus() {
+        const jobId = this.exportJobId;
+        if (!jobId) return;
+
+        try {
+            const response = await fetch(`/api/export/${jobId}`);
+            if (response.status === 404) {
+                // Jobs are only held in server memory, so a restart loses them
+                this.onExportError({ jobId, error: 'Export job was lost (server restarted)' });
+                return;
+            }
+            if (!response.ok) return;
+
+            const job = await response.json();
+            if (job.status === 'complete') {
+                this.onExportComplete(job);
+            } else if (job.status === 'error') {
+                this.onExportError(job);
+            }
+        } catch (error) {
+            console.error('Export status error:', error);
+        }
+    }
+
+    onExportError(result) {
+        if (result.jobId !== this.exportJobId) return;
+
+        this.log(`Export failed: ${result.error}`, 'error');
+        this.showToast('Export failed: ' + result.error, 'error');
+        this.finishExport();
+    }
+
+    finishExport() {
+        this.exportJobId = null;
+        document.getElementById('exportProgress').style.display = 'none';
+        document.getElementById('startExport').disabled = false;
+    }
+
     updateExportProgress(percent) {
         const progressFill = document.querySelector('.progress-fill');
         const progressText = document.querySelector('.progress-text');
@@ -1381,6 +1623,15 @@ class VideoEditor {
     }
 
     async saveProject() {
+        // Coalesce repeated saves (e.g. held Ctrl+S): while one request is
+        // running, remember that another is wanted and send a single
+        // follow-up with the latest state when it finishes
+        if (this.saveInFlight) {
+            this.saveQueued = true;
+            return;
+        }
+        this.saveInFlight = true;
+
         const projectData = {
             id: this.projectId || this.generateId(),
             name: this.projectName,
@@ -1412,6 +1663,12 @@ class VideoEditor {
             console.error('Save error:', error);
             this.showToast('Error saving project: ' + error.message, 'error');
         }
+
+        this.saveInFlight = false;
+        if (this.saveQueued) {
+            this.saveQueued = false;
+            this.saveProject();
+        }
     }
 
     async showLoadProjectModal() {
@@ -1464,7 +1721,9 @@ class VideoEditor {
                 this.projectId = projectData.id;
                 this.projectName = projectData.name;
                 this.mediaItems = projectData.mediaItems || [];
-                this.timelineClips = projectData.timelineClips || [];
+                this.mediaById = new Map(this.mediaItems.map(item => [item.id, item]));
+                this.timelineClips = (projectData.timelineClips || [])
+                    .sort((a, b) => a.start - b.start);
 
                 // Load tracks or use default
                 if (projectData.tracks && projectData.tracks.length > 0) {
@@ -1522,30 +1781,11 @@ class VideoEditor {
             return;
         }
 
+        const fragment = document.createDocumentFragment();
         this.mediaItems.forEach(item => {
-            const mediaEl = document.createElement('div');
-            mediaEl.className = 'media-item';
-            mediaEl.draggable = true;
-            mediaEl.dataset.mediaId = item.id;
-
-            const thumbnail = item.thumbnail || item.path;
-            const duration = this.formatTime(item.duration || 0);
-
-            mediaEl.innerHTML = `
-                ${item.type === 'audio' ?
-                    `<div class="media-thumbnail" style="display: flex; align-items: center; justify-content: center; background: #2d2d2d;">
-                        <span style="font-size: 2rem;">🎵</span>
-                    </div>` :
-                    `<img src="${thumbnail}" class="media-thumbnail" alt="${item.originalName}">`
-                }
-                <div class="media-info">
-                    <div class="media-name" title="${item.originalName}">${item.originalName}</div>
-                    <div class="media-duration">${duration}</div>
-                </div>
-            `;
-
-            this.elements.mediaLibrary.appendChild(mediaEl);
+            fragment.appendChild(this.createMediaElement(item, item.thumbnail || item.path));
         });
+        this.elements.mediaLibrary.appendChild(fragment);
     }
 
     generateId() {
@@ -1659,7 +1899,7 @@ class VideoEditor {
         const currentClip = this.getClipAtTime(this.currentTime);
 
         if (currentClip) {
-            const mediaItem = this.mediaItems.find(m => m.id === currentClip.mediaId);
+            const mediaItem = this.mediaById.get(currentClip.mediaId);
             if (mediaItem) {
                 // For low quality, we could potentially use a lower resolution version
                 // For now, we'll use the same file but this could be extended to use